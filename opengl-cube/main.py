@@ -1,15 +1,46 @@
-from src.game_renderer import GameRenderer
+from src.snapshot import SnapshotRing
+from src.frame_scheduler import FrameScheduler
 import pygame
-from OpenGL.GL import *
 import random
 import sys
 import os
 
+# Colores de los cubos (constantes para no crear tuplas en cada frame)
+HEAD_COLOR = (1.0, 0.0, 0.0)
+BODY_COLOR = (0.0, 1.0, 0.0)
+FOOD_COLOR = (0.0, 0.0, 1.0)
+
 class SnakeGame:
-    def __init__(self, width, height):
+    def __init__(self, width, height, headless=False, seed=None, board_size=20):
+        # Generador propio para que las partidas con semilla sean reproducibles
+        self.rng = random.Random(seed)
+        self.board_size = board_size
+        self.headless = headless
+        
+        # Últimos estados para rebobinar (unos 10 segundos a 10 ticks/s)
+        self.history = SnapshotRing(capacity=100)
+        
+        # Sin ventana ni contexto GL: solo la lógica del juego (bots, torneos)
+        if headless:
+            self.game = None
+            self.has_background_model = False
+            self.reset_game()
+            return
+        
+        # Importar aquí: PyOpenGL, glm y pyassimp solo hacen falta con ventana
+        from src.game_renderer import GameRenderer
+        
         pygame.init()
         self.game = GameRenderer(width, height) # Inicializa Pygame y contexto GL
         self.clock = pygame.time.Clock()
+        pygame.display.set_caption("Snake Game")  # Título fijo; el puntaje va en el HUD
+        self.show_stats = False  # Estadísticas del renderer (tecla F3)
+        
+        # Baja el ritmo de frames cuando la escena no cambia (game over, pausa, sin foco)
+        self.scheduler = FrameScheduler(self.clock, active_fps=10, idle_fps=2)
+        self.paused = False
+        self.focused = True
+        self.minimized = False
         
         # Crear instancia del cargador para el fondo
         model_path = os.path.join(os.path.dirname(__file__), 'src', 'movie_camera.fbx')
@@ -32,15 +63,23 @@ class SnakeGame:
 
     def reset_game(self):
         # Game state
-        self.snake = [[10, 10], [9, 10], [8, 10]]  # Initial snake position
+        center = self.board_size // 2
+        self.snake = [[center, center], [(center - 1) % self.board_size, center],
+                      [(center - 2) % self.board_size, center]]  # Initial snake position
         self.direction = [1, 0]  # Moving right initially
         self.food = self.generate_food()
         self.score = 0
         self.game_over = False
+        self.history.clear()
         
+    @property
+    def won(self):
+        """La serpiente ocupa todo el tablero"""
+        return len(self.snake) == self.board_size * self.board_size
+
     def generate_food(self):
         while True:
-            food = [random.randint(0, 19), random.randint(0, 19)]
+            food = [self.rng.randint(0, self.board_size - 1), self.rng.randint(0, self.board_size - 1)]
             if food not in self.snake:
                 return food
 
@@ -48,32 +87,56 @@ class SnakeGame:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 return False
+            # Ventana sin foco o minimizada: la partida se detiene
+            if event.type == pygame.WINDOWFOCUSLOST:
+                self.focused = False
+            elif event.type == pygame.WINDOWFOCUSGAINED:
+                self.focused = True
+            elif event.type == pygame.WINDOWMINIMIZED:
+                self.minimized = True
+            elif event.type == pygame.WINDOWRESTORED:
+                self.minimized = False
             if event.type == pygame.KEYDOWN:
                 # Arrow key controls with inverted up/down movement
-                if event.key == pygame.K_UP and self.direction != [0, -1]:
+                # (ignored while paused so no reversal piles up before resuming)
+                if event.key == pygame.K_UP and not self.paused and self.direction != [0, -1]:
                     self.direction = [0, 1]   # Down movement (inverted)
-                elif event.key == pygame.K_DOWN and self.direction != [0, 1]:
+                elif event.key == pygame.K_DOWN and not self.paused and self.direction != [0, 1]:
                     self.direction = [0, -1]  # Up movement (inverted)
-                elif event.key == pygame.K_LEFT and self.direction != [1, 0]:
+                elif event.key == pygame.K_LEFT and not self.paused and self.direction != [1, 0]:
                     self.direction = [-1, 0]  # Left movement
-                elif event.key == pygame.K_RIGHT and self.direction != [-1, 0]:
+                elif event.key == pygame.K_RIGHT and not self.paused and self.direction != [-1, 0]:
                     self.direction = [1, 0]   # Right movement
+                # Pause with 'p'
+                elif event.key == pygame.K_p and not self.game_over:
+                    self.paused = not self.paused
+                # Toggle renderer stats with F3
+                elif event.key == pygame.K_F3:
+                    self.show_stats = not self.show_stats
                 # Quit with 'q'
                 elif event.key == pygame.K_q:
                     return False
+                # Rewind about one second with backspace
+                elif event.key == pygame.K_BACKSPACE:
+                    self.history.rewind(self, min(10, len(self.history)))
                 # Restart with spacebar when game is over
                 elif event.key == pygame.K_SPACE and self.game_over:
                     self.reset_game()
         return True
 
+    def set_direction(self, direction):
+        """Cambiar de dirección salvo que sea un giro de 180 grados (usado por bots)"""
+        if direction[0] != -self.direction[0] or direction[1] != -self.direction[1]:
+            self.direction = list(direction)
+
     def update(self):
         if self.game_over:
             return
 
         # Calculate new head position
         new_head = [
-            (self.snake[0][0] + self.direction[0]) % 20,  # Wrap around horizontally
-            (self.snake[0][1] + self.direction[1]) % 20   # Wrap around vertically
+            (self.snake[0][0] + self.direction[0]) % self.board_size,  # Wrap around horizontally
+            (self.snake[0][1] + self.direction[1]) % self.board_size   # Wrap around vertically
         ]
 
         # Check if snake hits itself
@@ -87,46 +150,100 @@ class SnakeGame:
         # Check food collision
         if new_head == self.food:
             self.score += 10
+            # Tablero lleno: ya no hay celda libre para la comida, fin de la partida
+            if self.won:
+                self.game_over = True
+                return
             self.food = self.generate_food()
         else:
             self.snake.pop()
 
     def render(self):
-        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        self.game.begin_frame()
         
         # Dibujar el modelo de fondo si está cargado
         if self.has_background_model:
-            # Ajusta scale y z_distance según necesites
-            self.game.draw_background_model('background_camera', scale=0.02, z_distance=15.0) 
-        
-        # Draw snake
-        for i, segment in enumerate(self.snake):
-            if i == 0:
-                # Head color (red)
-                self.game.draw_cube(segment[0], segment[1], color=(1.0, 0.0, 0.0))
-            else:
-                # Body color (green)
-                self.game.draw_cube(segment[0], segment[1], color=(0.0, 1.0, 0.0))
+            # Ajusta scale y z_distance según necesites; impostor=True reutiliza
+            # una textura horneada en lugar de redibujar toda la malla
+            self.game.draw_background_model('background_camera', scale=0.02, z_distance=15.0,
+                                            impostor=True)
+        
+        # Draw snake: head (red) then body (green)
+        draw_cube = self.game.draw_cube
+        head = self.snake[0]
+        draw_cube(head[0], head[1], HEAD_COLOR)
+        for i in range(1, len(self.snake)):
+            segment = self.snake[i]
+            draw_cube(segment[0], segment[1], BODY_COLOR)
         
-        # Draw food (blue cube)
-        self.game.draw_cube(self.food[0], self.food[1], color=(0.0, 0.0, 1.0))
+        # Draw food (blue cube); with a full board it was eaten under the head
+        if not self.won:
+            draw_cube(self.food[0], self.food[1], FOOD_COLOR)
         
-        pygame.display.flip()
+        self.update_hud()
+        self.game.end_frame()
+
+    def update_hud(self):
+        # El HUD solo vuelve a teselar los textos que cambiaron
+        hud = self.game.hud
+        line = hud.line_height
+        hud.set_text('score', f"Score: {self.score}", 10, 10)
+        hud.set_text('fps', f"FPS: {self.clock.get_fps():.0f}", 10, 10 + line,
+                     color=(0.7, 0.7, 0.7, 1.0))
+        
+        if self.game_over:
+            message = "YOU WIN!" if self.won else "GAME OVER!"
+            hud.set_text('game_over', f"{message} Press SPACE to restart or Q to quit",
+                         10, 10 + 2 * line, color=(1.0, 0.3, 0.3, 1.0))
+        elif self.paused:
+            hud.set_text('game_over', "PAUSED - Press P to resume",
+                         10, 10 + 2 * line, color=(1.0, 1.0, 0.3, 1.0))
+        elif not self.focused:
+            # Se reanuda sola al recuperar el foco; P aquí pausaría de verdad
+            hud.set_text('game_over', "PAUSED - Click the window to resume",
+                         10, 10 + 2 * line, color=(1.0, 1.0, 0.3, 1.0))
+        else:
+            hud.remove_text('game_over')
+        
+        if self.show_stats:
+            stream = self.game.stream_buffer.stats
+            hud.set_text('stats', f"Stream: {stream['last_frame_bytes']} B/frame  "
+                                  f"Fence waits: {stream['fence_waits']}",
+                         10, 10 + 3 * line, color=(0.7, 0.7, 0.7, 1.0))
+            state = self.game.state
+            hud.set_text('state', f"State changes: {state.state_changes()}  "
+                                  f"Skipped: {state.last_frame_stats['redundant_skipped']}",
+                         10, 10 + 4 * line, color=(0.7, 0.7, 0.7, 1.0))
+            pacing = self.scheduler.stats
+            hud.set_text('pacing', f"Frames skipped: {pacing['frames_skipped']}  "
+                                   f"CPU saved: {pacing['cpu_saved_ms']:.0f} ms",
+                         10, 10 + 5 * line, color=(0.7, 0.7, 0.7, 1.0))
+        else:
+            hud.remove_text('stats')
+            hud.remove_text('state')
+            hud.remove_text('pacing')
+
+    def is_static(self):
+        """La escena no cambia salvo el fondo: se puede bajar el ritmo de frames"""
+        return self.game_over or self.paused or not self.focused or self.minimized
 
     def run(self):
         running = True
         while running:
+            self.scheduler.begin_frame()
             running = self.handle_input()
             if running:
-                self.update()
-                self.render()
-                self.clock.tick(10)  # Game speed
+                static = self.is_static()
+                if not static:
+                    self.history.push(self)
+                    self.update()
                 
-                # Display score and game instructions
-                caption = f"Snake Game - Score: {self.score}"
-                if self.game_over:
-                    caption += " - GAME OVER! Press SPACE to restart or Q to quit"
-                pygame.display.set_caption(caption)
+                # Minimizada: no dibujar y esperar al siguiente evento
+                visible = not self.minimized
+                if visible:
+                    self.render()
+                self.scheduler.end_frame(rendered=visible, static=static)
+                self.scheduler.wait(static=self.is_static(), visible=visible)
         
         # Limpiar recursos antes de salir
         self.game.cleanup() 
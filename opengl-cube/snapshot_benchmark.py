@@ -0,0 +1,67 @@
+"""Benchmark de tamaño y latencia de los snapshots de SnakeGame.
+
+Construye serpientes largas en tableros grandes y mide cuánto ocupa el
+snapshot y cuánto tardan save_snapshot, restore_snapshot y fork_game.
+
+Ejemplo:
+    python snapshot_benchmark.py --sizes 20,200,1000 --repeats 20
+"""
+import argparse
+import pickle
+import time
+
+from main import SnakeGame
+from src.snapshot import save_snapshot, restore_snapshot, fork_game
+
+def serpentine_body(board_size, length):
+    """Cuerpo en zigzag que recorre el tablero fila por fila"""
+    body = []
+    for y in range(board_size):
+        row = range(board_size) if y % 2 == 0 else range(board_size - 1, -1, -1)
+        for x in row:
+            body.append([x, y])
+            if len(body) == length:
+                return body[::-1]
+    return body[::-1]
+
+def time_call(function, repeats):
+    """Tiempo medio por llamada en milisegundos"""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        function()
+    return (time.perf_counter() - start) / repeats * 1000.0
+
+def benchmark(board_size, fill, repeats):
+    game = SnakeGame(0, 0, headless=True, seed=1, board_size=board_size)
+    length = max(3, int(board_size * board_size * fill))
+    game.snake = serpentine_body(board_size, length)
+    game.food = [board_size - 1, board_size - 1]
+
+    snapshot = save_snapshot(game)
+    target = SnakeGame(0, 0, headless=True, board_size=board_size)
+    return {
+        'board': board_size,
+        'segments': len(game.snake),
+        'snapshot_bytes': len(snapshot),
+        'pickle_bytes': len(pickle.dumps((game.snake, game.rng.getstate()))),
+        'save_ms': time_call(lambda: save_snapshot(game), repeats),
+        'restore_ms': time_call(lambda: restore_snapshot(target, snapshot), repeats),
+        'fork_ms': time_call(lambda: fork_game(game), repeats)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de snapshots de SnakeGame")
+    parser.add_argument('--sizes', default='20,100,500,1000', help="Tamaños de tablero separados por comas")
+    parser.add_argument('--fill', type=float, default=0.5, help="Fracción del tablero ocupada por la serpiente")
+    parser.add_argument('--repeats', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'board':>6} {'segments':>9} {'snapshot B':>11} {'pickle B':>11} "
+          f"{'save ms':>9} {'restore ms':>11} {'fork ms':>9}")
+    for size in (int(value) for value in args.sizes.split(',')):
+        r = benchmark(size, args.fill, args.repeats)
+        print(f"{r['board']:>6} {r['segments']:>9} {r['snapshot_bytes']:>11} {r['pickle_bytes']:>11} "
+              f"{r['save_ms']:>9.3f} {r['restore_ms']:>11.3f} {r['fork_ms']:>9.3f}")
+
+if __name__ == "__main__":
+    main()
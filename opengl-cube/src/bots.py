@@ -0,0 +1,51 @@
+"""Controladores automáticos para SnakeGame.
+
+Cada bot es una función bot(game, rng) -> dirección [dx, dy]. Solo usan el
+estado lógico del juego, así que funcionan en modo headless.
+"""
+
+DIRECTIONS = ([1, 0], [-1, 0], [0, 1], [0, -1])
+
+def _safe_directions(game):
+    """Direcciones que no invierten el movimiento ni chocan con el cuerpo"""
+    size = game.board_size
+    head_x, head_y = game.snake[0]
+    safe = []
+    for dx, dy in DIRECTIONS:
+        if dx == -game.direction[0] and dy == -game.direction[1]:
+            continue
+        cell = [(head_x + dx) % size, (head_y + dy) % size]
+        if cell not in game.snake:
+            safe.append([dx, dy])
+    return safe
+
+def _wrapped_distance(a, b, size):
+    """Distancia Manhattan en un tablero que da la vuelta en los bordes"""
+    dx = abs(a[0] - b[0])
+    dy = abs(a[1] - b[1])
+    return min(dx, size - dx) + min(dy, size - dy)
+
+def random_bot(game, rng):
+    """Elige al azar entre los movimientos seguros"""
+    safe = _safe_directions(game)
+    return rng.choice(safe) if safe else game.direction
+
+def greedy_bot(game, rng):
+    """Se acerca a la comida por el movimiento seguro más corto"""
+    safe = _safe_directions(game)
+    if not safe:
+        return game.direction
+    size = game.board_size
+    head_x, head_y = game.snake[0]
+    best = min(_wrapped_distance([(head_x + dx) % size, (head_y + dy) % size], game.food, size)
+               for dx, dy in safe)
+    candidates = [d for d in safe
+                  if _wrapped_distance([(head_x + d[0]) % size, (head_y + d[1]) % size],
+                                       game.food, size) == best]
+    return rng.choice(candidates)
+
+# Registro de bots disponibles por nombre
+BOTS = {
+    'random': random_bot,
+    'greedy': greedy_bot
+}
@@ -0,0 +1,67 @@
+import time
+import pygame
+
+class FrameScheduler:
+    """Ritmo de frames adaptativo con modo de ahorro de energía.
+
+    Con la escena activa limita el bucle a `active_fps`. Si la escena es
+    estática (game over, pausa, ventana sin foco) espera eventos con un
+    tiempo límite para bajar a `idle_fps`, y si la ventana está minimizada
+    se bloquea en pygame.event.wait hasta que llegue un evento. Cualquier
+    entrada despierta el bucle al instante.
+    """
+
+    def __init__(self, clock, active_fps=10, idle_fps=2):
+        self.clock = clock
+        self.active_fps = active_fps
+        self.idle_fps = idle_fps
+
+        self.frame_start = None
+        self.active_frame_cpu_ms = 0.0  # Media móvil del CPU de un frame activo
+        self.skipped = 0.0              # Frames no dibujados respecto al ritmo activo
+
+        self.stats = {
+            'frames_rendered': 0,
+            'frames_skipped': 0,
+            'idle_seconds': 0.0,
+            'cpu_saved_ms': 0.0
+        }
+
+    def begin_frame(self):
+        """Marcar el inicio del trabajo del frame (entrada, lógica, render)"""
+        self.frame_start = time.process_time()
+
+    def end_frame(self, rendered=True, static=False):
+        """Registrar el CPU usado por el frame"""
+        if rendered:
+            self.stats['frames_rendered'] += 1
+        if self.frame_start is not None and rendered and not static:
+            cpu_ms = (time.process_time() - self.frame_start) * 1000.0
+            self.active_frame_cpu_ms += (cpu_ms - self.active_frame_cpu_ms) * 0.1
+        self.frame_start = None
+
+    def wait(self, static=False, visible=True):
+        """Esperar hasta el siguiente frame según el estado de la escena"""
+        if visible and not static:
+            self.clock.tick(self.active_fps)
+            return
+
+        start = time.perf_counter()
+        if visible:
+            event = pygame.event.wait(int(1000 / self.idle_fps))
+        else:
+            event = pygame.event.wait()
+        # Devolver el evento a la cola para que lo procese handle_input
+        if event.type != pygame.NOEVENT:
+            pygame.event.post(event)
+        elapsed = time.perf_counter() - start
+
+        # Frames que el ritmo activo habría dibujado durante la espera
+        would_render = elapsed * self.active_fps
+        self.skipped += max(0.0, would_render - 1.0) if visible else would_render
+        self.stats['frames_skipped'] = int(self.skipped)
+        self.stats['idle_seconds'] += elapsed
+        self.stats['cpu_saved_ms'] = self.skipped * self.active_frame_cpu_ms
+
+        # Reiniciar la medición del reloj para no contar la espera como un frame lento
+        self.clock.tick()
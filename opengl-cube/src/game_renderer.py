@@ -7,9 +7,16 @@ from OpenGL.GL import *
 import glm
 from src.shader_loader import ShaderLoader
 from src.model_loader import ModelLoader
+from src.stream_buffer import StreamBuffer
+from src.hud_renderer import HudRenderer
+from src.render_state import GLStateCache, RenderQueue
+
+# Escala y profundidad fijas de cada cubo del tablero
+CUBE_SCALE = 0.05
+CUBE_DEPTH = -5.0
 
 class GameRenderer:
-    def __init__(self, width, height):
+    def __init__(self, width, height, max_cubes=20 * 20):
         pygame.init()
         
         # Configurar atributos OpenGL para Core Profile (necesario en macOS)
@@ -23,6 +30,10 @@ class GameRenderer:
         self.width = width
         self.height = height
         
+        # Caché de estado GL y cola de dibujo ordenada por estado
+        self.state = GLStateCache()
+        self.render_queue = RenderQueue()
+        
         # Inicializar shaders y configuración GL
         self.setup_gl()
         
@@ -32,6 +43,17 @@ class GameRenderer:
         
         # Inicializar VBO/VAO para el cubo
         self.setup_cube_buffers()
+        self.setup_cube_batch(max_cubes)
+        
+        # Recursos para dibujar el fondo como impostor (textura cacheada)
+        self.background_impostors = {}
+        self.setup_impostor_resources()
+        
+        # Buffer circular para datos dinámicos por frame (HUD, instancias, debug)
+        self.stream_buffer = StreamBuffer(state_cache=self.state)
+        
+        # HUD dibujado en OpenGL (puntaje, FPS, estadísticas)
+        self.hud = HudRenderer(self.stream_buffer, self.state, width, height)
     
     def setup_gl(self):
         """Configuración moderna de OpenGL con shaders"""
@@ -40,7 +62,7 @@ class GameRenderer:
         vertex_path = os.path.join(current_dir, 'shaders', 'vertex.glsl')
         fragment_path = os.path.join(current_dir, 'shaders', 'fragment.glsl')
         
-        self.shader = ShaderLoader()
+        self.shader = ShaderLoader(self.state)
         self.shader.load_shader(vertex_path, fragment_path)
         
         # Configuración de OpenGL
@@ -149,28 +171,152 @@ class GameRenderer:
         # Desvincular
         glBindVertexArray(0)
     
+    def setup_cube_batch(self, capacity):
+        """Matrices de modelo precalculadas para los cubos (una fila por celda).
+        
+        Cada fila es una mat4 column-major con la escala ya puesta; draw_cube
+        solo escribe la traslación, así el bucle de dibujo no crea objetos.
+        """
+        template = np.zeros(16, dtype=np.float32)
+        template[0] = template[5] = template[10] = CUBE_SCALE
+        template[14] = CUBE_DEPTH
+        template[15] = 1.0
+        
+        self.cube_transforms = np.tile(template, (capacity, 1))
+        self.cube_color_ids = [0] * capacity
+        self.cube_palette = []      # Colores distintos usados (índice = id)
+        self.cube_palette_ids = {}  # color -> id
+        self.cube_count = 0
+    
+    def _grow_cube_batch(self):
+        """Duplicar la capacidad si el tablero tiene más cubos de lo previsto"""
+        capacity = len(self.cube_transforms)
+        self.cube_transforms = np.concatenate([self.cube_transforms, self.cube_transforms])
+        self.cube_color_ids.extend([0] * capacity)
+    
     def draw_cube(self, x, y, color=(1.0, 1.0, 1.0)):
-        """Dibujar cubo usando shaders y transformaciones modernas"""
-        # Matriz de modelo para este cubo específico
-        model = glm.mat4(1.0)  # Matriz identidad
-        model = glm.translate(model, glm.vec3(x * 0.1 - 1, y * 0.1 - 1, -5.0))
-        model = glm.scale(model, glm.vec3(0.05, 0.05, 0.05))
-        
-        # Usar shader y configurar uniforms
-        self.shader.use()
-        self.shader.set_mat4("model", model)
-        self.shader.set_mat4("view", self.view)
-        self.shader.set_mat4("projection", self.projection)
-        self.shader.set_vec3("lightPos", self.light_pos)
-        self.shader.set_vec3("viewPos", self.view_pos)
-        self.shader.set_vec3("lightColor", (1.0, 1.0, 1.0))
-        self.shader.set_vec3("objectColor", color)
-        
-        # Dibujar
-        glBindVertexArray(self.cube_vao)
-        glDrawElements(GL_TRIANGLES, 36, GL_UNSIGNED_INT, None)
+        """Añadir un cubo al lote del frame; se dibuja al vaciar la cola en end_frame"""
+        i = self.cube_count
+        if i == 0:
+            # El lote entero es una sola entrada de la cola, ordenada por programa y VAO
+            self.render_queue.submit_batch(self.shader, self.cube_vao, self._draw_cube_batch)
+        if i == len(self.cube_transforms):
+            self._grow_cube_batch()
+        
+        # Solo cambia la traslación; escala y profundidad ya están en la fila
+        self.cube_transforms[i, 12] = x * 0.1 - 1
+        self.cube_transforms[i, 13] = y * 0.1 - 1
+        
+        color_id = self.cube_palette_ids.get(color)
+        if color_id is None:
+            color_id = len(self.cube_palette)
+            self.cube_palette.append(color)
+            self.cube_palette_ids[color] = color_id
+        self.cube_color_ids[i] = color_id
+        self.cube_count = i + 1
+    
+    def _set_shared_uniforms(self, shader, projection=None):
+        """Uniforms comunes del frame: una vez por programa, no por objeto"""
+        shader.use()
+        shader.set_mat4("view", self.view)
+        shader.set_mat4("projection", projection if projection is not None else self.projection)
+        shader.set_vec3("lightPos", self.light_pos)
+        shader.set_vec3("viewPos", self.view_pos)
+        shader.set_vec3("lightColor", (1.0, 1.0, 1.0))
+    
+    def _draw_cube_batch(self, shader):
+        """Dibujar los cubos del frame desde las filas precalculadas
+        (programa, uniforms comunes y VAO ya activos)"""
+        current_color = -1
+        for i in range(self.cube_count):
+            color_id = self.cube_color_ids[i]
+            if color_id != current_color:
+                shader.set_vec3("objectColor", self.cube_palette[color_id])
+                current_color = color_id
+            shader.set_mat4("model", self.cube_transforms[i])
+            glDrawElements(GL_TRIANGLES, 36, GL_UNSIGNED_INT, None)
+        
+        self.cube_count = 0
+    
+    def flush_render_queue(self, render_queue=None, projection=None):
+        """Dibujar los comandos encolados (cubos y mallas de modelos),
+        agrupados por programa, VAO y color"""
+        if render_queue is None:
+            render_queue = self.render_queue
+        
+        current_shader = None
+        current_color = None
+        for command in render_queue.sorted_commands():
+            shader = command['shader']
+            if shader is not current_shader:
+                self._set_shared_uniforms(shader, projection)
+                current_shader = shader
+                current_color = None
+            
+            self.state.bind_vertex_array(command['vao'])
+            if command['batch'] is not None:
+                command['batch'](shader)
+                current_color = None
+                continue
+            
+            if command['color'] != current_color:
+                shader.set_vec3("objectColor", command['color'])
+                current_color = command['color']
+            shader.set_mat4("model", command['model'])
+            glDrawElements(GL_TRIANGLES, command['index_count'], GL_UNSIGNED_INT, None)
+        
+        render_queue.clear()
+    
+    def setup_impostor_resources(self):
+        """Shader y quad para dibujar modelos de fondo horneados en una textura"""
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        vertex_path = os.path.join(current_dir, 'shaders', 'impostor_vertex.glsl')
+        fragment_path = os.path.join(current_dir, 'shaders', 'impostor_fragment.glsl')
+        
+        self.impostor_shader = ShaderLoader(self.state)
+        self.impostor_shader.load_shader(vertex_path, fragment_path)
+        
+        # Quad que cubre [-1, 1] (triangle strip)
+        quad_vertices = np.array([
+            -1.0, -1.0,
+             1.0, -1.0,
+            -1.0,  1.0,
+             1.0,  1.0
+        ], dtype=np.float32)
+        
+        self.impostor_vao = glGenVertexArrays(1)
+        self.impostor_vbo = glGenBuffers(1)
+        
+        glBindVertexArray(self.impostor_vao)
+        glBindBuffer(GL_ARRAY_BUFFER, self.impostor_vbo)
+        glBufferData(GL_ARRAY_BUFFER, quad_vertices.nbytes, quad_vertices, GL_STATIC_DRAW)
+        
+        # Posición 2D (location 0)
+        glEnableVertexAttribArray(0)
+        glVertexAttribPointer(0, 2, GL_FLOAT, GL_FALSE, 
+                             2 * np.dtype(np.float32).itemsize, 
+                             ctypes.c_void_p(0))
+        
         glBindVertexArray(0)
     
+    def begin_frame(self):
+        """Preparar el frame: limpiar pantalla y reservar la región del buffer dinámico"""
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        self.state.begin_frame()
+        self.stream_buffer.begin_frame()
+    
+    def end_frame(self):
+        """Cerrar el frame: vaciar la cola de dibujo, dibujar el HUD, marcar la
+        región del buffer dinámico y presentar"""
+        self.flush_render_queue()
+        self.hud.draw()
+        self.stream_buffer.end_frame()
+        pygame.display.flip()
+    
+    def stream_data(self, data):
+        """Subir datos dinámicos al buffer circular; devuelve el offset en bytes"""
+        return self.stream_buffer.allocate(data)
+    
     def load_fbx_model(self, model_name, file_path):
         """Crea una instancia de ModelLoader para un modelo FBX"""
         model = ModelLoader() 
@@ -178,36 +324,156 @@ class GameRenderer:
         print(f"Instancia de ModelLoader creada para '{model_name}'.")
         return model
     
-    def draw_background_model(self, model_name, scale=1.0, z_distance=10.0):
-        """Dibujar un modelo FBX como fondo, rotando en Z"""
+    def draw_background_model(self, model_name, scale=1.0, z_distance=10.0, impostor=False):
+        """Dibujar un modelo FBX como fondo, rotando en Z
+        
+        Con impostor=True el modelo se hornea una sola vez en una textura y
+        cada frame solo se dibuja un quad rotado. Si el FBO no es compatible
+        se dibuja la geometría completa.
+        """
         if model_name not in self.models:
             return False
+        
+        if impostor and self._draw_background_impostor(model_name, scale, z_distance):
+            # Incrementar rotación
+            self.background_rotation_z = (self.background_rotation_z + 0.5) % 360
+            return True
             
+        # Las mallas se encolan y se dibujan junto a los cubos en end_frame
+        self._submit_background_geometry(self.render_queue, model_name, scale, z_distance,
+                                         self.background_rotation_z)
+        
+        # Incrementar rotación
+        self.background_rotation_z = (self.background_rotation_z + 0.5) % 360
+        return True
+    
+    def _submit_background_geometry(self, render_queue, model_name, scale, z_distance, rotation_z):
+        """Encolar la geometría completa del modelo de fondo (iluminación Phong)"""
         model_loader = self.models[model_name]
         
         # Crear matriz de modelo para el fondo
         model_matrix = glm.mat4(1.0)
         model_matrix = glm.translate(model_matrix, glm.vec3(0.0, 0.0, -z_distance))
-        model_matrix = glm.rotate(model_matrix, glm.radians(self.background_rotation_z), glm.vec3(0.0, 0.0, 1.0))
+        model_matrix = glm.rotate(model_matrix, glm.radians(rotation_z), glm.vec3(0.0, 0.0, 1.0))
         model_matrix = glm.scale(model_matrix, glm.vec3(scale, scale, scale))
         
-        # Configurar shader
-        self.shader.use()
-        self.shader.set_mat4("model", model_matrix)
-        self.shader.set_mat4("view", self.view)
-        self.shader.set_mat4("projection", self.projection)
-        self.shader.set_vec3("lightPos", self.light_pos)
-        self.shader.set_vec3("viewPos", self.view_pos)
-        self.shader.set_vec3("lightColor", (1.0, 1.0, 1.0))
-        self.shader.set_vec3("objectColor", (0.8, 0.8, 0.8))  # Color gris claro
+        # Color gris claro
+        model_loader.submit(render_queue, self.shader, model_matrix, (0.8, 0.8, 0.8))
+    
+    def _impostor_extent(self):
+        """Extensión en NDC que debe cubrir la textura para que el quad rotado
+        siga tapando toda la ventana en cualquier ángulo"""
+        aspect = self.width / self.height
+        return ((aspect * aspect + 1.0) ** 0.5) / min(aspect, 1.0)
+    
+    def _bake_background_impostor(self, model_name, scale, z_distance):
+        """Renderizar el modelo de fondo (sin rotación) en una textura fuera de pantalla"""
+        extent = self._impostor_extent()
+        tex_width = int(self.width * extent)
+        tex_height = int(self.height * extent)
         
-        # Dibujar el modelo
-        model_loader.draw()
+        impostor = self.background_impostors.get(model_name)
+        if impostor is None or impostor['size'] != (tex_width, tex_height):
+            if impostor is not None:
+                self._delete_impostor(impostor)
+            
+            texture = glGenTextures(1)
+            glBindTexture(GL_TEXTURE_2D, texture)
+            glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA8, tex_width, tex_height, 0,
+                         GL_RGBA, GL_UNSIGNED_BYTE, None)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
+            glBindTexture(GL_TEXTURE_2D, 0)
+            
+            depth_rbo = glGenRenderbuffers(1)
+            glBindRenderbuffer(GL_RENDERBUFFER, depth_rbo)
+            glRenderbufferStorage(GL_RENDERBUFFER, GL_DEPTH_COMPONENT24, tex_width, tex_height)
+            glBindRenderbuffer(GL_RENDERBUFFER, 0)
+            
+            fbo = glGenFramebuffers(1)
+            glBindFramebuffer(GL_FRAMEBUFFER, fbo)
+            glFramebufferTexture2D(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_TEXTURE_2D, texture, 0)
+            glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_DEPTH_ATTACHMENT, GL_RENDERBUFFER, depth_rbo)
+            status = glCheckFramebufferStatus(GL_FRAMEBUFFER)
+            glBindFramebuffer(GL_FRAMEBUFFER, 0)
+            
+            impostor = {
+                'fbo': fbo,
+                'texture': texture,
+                'depth_rbo': depth_rbo,
+                'size': (tex_width, tex_height),
+                'key': None,
+                'unsupported': False
+            }
+            self.background_impostors[model_name] = impostor
+            
+            if status != GL_FRAMEBUFFER_COMPLETE:
+                print(f"Error: Framebuffer incompleto para el impostor de '{model_name}'")
+                self._delete_impostor(impostor)
+                # Recordar el fallo para no reintentar el horneado cada frame
+                self.background_impostors[model_name] = {'unsupported': True}
+                return None
         
-        # Incrementar rotación
-        self.background_rotation_z = (self.background_rotation_z + 0.5) % 360
+        # Proyección ampliada para que la textura cubra [-extent, extent] en NDC
+        bake_projection = glm.scale(glm.mat4(1.0), glm.vec3(1.0 / extent, 1.0 / extent, 1.0)) * self.projection
+        
+        glBindFramebuffer(GL_FRAMEBUFFER, impostor['fbo'])
+        glViewport(0, 0, tex_width, tex_height)
+        glClearColor(0.0, 0.0, 0.0, 0.0)  # Transparente fuera del modelo
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        
+        # Cola propia: el horneado se dibuja ya, con la proyección ampliada
+        bake_queue = RenderQueue()
+        self._submit_background_geometry(bake_queue, model_name, scale, z_distance, 0.0)
+        self.flush_render_queue(bake_queue, bake_projection)
+        
+        # Restaurar framebuffer y estado por defecto
+        glBindFramebuffer(GL_FRAMEBUFFER, 0)
+        glViewport(0, 0, self.width, self.height)
+        glClearColor(0.05, 0.05, 0.05, 1.0)
+        
+        # La creación de texturas y FBO llama a GL directamente
+        self.state.invalidate()
+        return impostor
+    
+    def _draw_background_impostor(self, model_name, scale, z_distance):
+        """Dibujar el fondo como un quad rotado con la textura horneada.
+        Solo se vuelve a hornear si cambian la luz, la escala o el viewport."""
+        bake_key = (scale, z_distance, tuple(self.light_pos), tuple(self.view_pos),
+                    self.width, self.height)
+        
+        impostor = self.background_impostors.get(model_name)
+        if impostor is not None and impostor['unsupported']:
+            return False
+        if impostor is None or impostor['key'] != bake_key:
+            impostor = self._bake_background_impostor(model_name, scale, z_distance)
+            if impostor is None:
+                return False
+            impostor['key'] = bake_key
+        
+        self.impostor_shader.use()
+        self.impostor_shader.set_float("angle", glm.radians(self.background_rotation_z))
+        self.impostor_shader.set_float("aspect", self.width / self.height)
+        self.impostor_shader.set_float("extent", self._impostor_extent())
+        self.impostor_shader.set_int("impostorTexture", 0)
+        
+        self.state.bind_texture(GL_TEXTURE_2D, impostor['texture'])
+        
+        # El fondo no escribe profundidad: los cubos siempre quedan delante
+        self.state.set_capability(GL_DEPTH_TEST, False)
+        self.state.bind_vertex_array(self.impostor_vao)
+        glDrawArrays(GL_TRIANGLE_STRIP, 0, 4)
+        self.state.set_capability(GL_DEPTH_TEST, True)
         return True
     
+    def _delete_impostor(self, impostor):
+        """Liberar FBO, textura y renderbuffer de un impostor"""
+        glDeleteFramebuffers(1, [impostor['fbo']])
+        glDeleteTextures([impostor['texture']])
+        glDeleteRenderbuffers(1, [impostor['depth_rbo']])
+    
     def cleanup(self):
         """Limpia todos los recursos OpenGL"""
         print("Limpiando GameRenderer...")
@@ -218,6 +484,24 @@ class GameRenderer:
             model.cleanup()
         self.models = {}
         
+        # Limpiar impostores del fondo
+        for impostor in self.background_impostors.values():
+            if not impostor['unsupported']:
+                self._delete_impostor(impostor)
+        self.background_impostors = {}
+        if hasattr(self, 'impostor_vao'):
+            glDeleteVertexArrays(1, [self.impostor_vao])
+        if hasattr(self, 'impostor_vbo'):
+            glDeleteBuffers(1, [self.impostor_vbo])
+        if hasattr(self, 'impostor_shader'):
+            self.impostor_shader.cleanup()
+        
+        # Limpiar HUD y buffer dinámico
+        if hasattr(self, 'hud'):
+            self.hud.cleanup()
+        if hasattr(self, 'stream_buffer'):
+            self.stream_buffer.cleanup()
+        
         # Limpiar recursos del cubo
         if hasattr(self, 'cube_vao'):
             glDeleteVertexArrays(1, [self.cube_vao])
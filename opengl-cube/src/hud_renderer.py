@@ -0,0 +1,203 @@
+import os
+import ctypes
+import numpy as np
+import pygame
+from OpenGL.GL import *
+from src.shader_loader import ShaderLoader
+
+# x, y, u, v, r, g, b, a
+HUD_VERTEX_FLOATS = 8
+HUD_VERTEX_STRIDE = HUD_VERTEX_FLOATS * np.dtype(np.float32).itemsize
+
+class HudRenderer:
+    """Texto y HUD dibujados en OpenGL con un atlas de glifos.
+
+    El atlas se genera una sola vez a partir de una fuente de pygame. Cada
+    texto se guarda en un "slot" con nombre y solo se vuelve a teselar cuando
+    su contenido cambia; todos los slots se dibujan con una sola llamada.
+    """
+
+    def __init__(self, stream_buffer, state_cache, width, height, font_name=None, font_size=20):
+        self.stream_buffer = stream_buffer
+        self.state = state_cache
+        self.width = width
+        self.height = height
+
+        self.slots = {}           # nombre -> {'text', 'x', 'y', 'color', 'vertices'}
+        self.batch = None         # Vértices de todos los slots concatenados
+        self.batch_dirty = False
+
+        self.stats = {
+            'retessellations': 0,
+            'draw_calls': 0
+        }
+
+        self.setup_shader()
+        self.build_glyph_atlas(font_name, font_size)
+        self.setup_buffers()
+
+    def setup_shader(self):
+        """Cargar el shader del HUD"""
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        vertex_path = os.path.join(current_dir, 'shaders', 'hud_vertex.glsl')
+        fragment_path = os.path.join(current_dir, 'shaders', 'hud_fragment.glsl')
+
+        self.shader = ShaderLoader(self.state)
+        self.shader.load_shader(vertex_path, fragment_path)
+
+    def build_glyph_atlas(self, font_name, font_size, atlas_width=512):
+        """Renderizar los caracteres ASCII imprimibles en una única textura"""
+        pygame.font.init()
+        font = pygame.font.Font(font_name, font_size)
+        self.line_height = font.get_linesize()
+
+        # Renderizar glifos y calcular su posición en el atlas (por filas)
+        glyph_surfaces = {}
+        positions = {}
+        x, y = 0, 0
+        row_height = 0
+        for code in range(32, 127):
+            char = chr(code)
+            surface = font.render(char, True, (255, 255, 255))
+            w, h = surface.get_size()
+            if x + w > atlas_width:
+                x = 0
+                y += row_height + 1
+                row_height = 0
+            glyph_surfaces[char] = surface
+            positions[char] = (x, y, w, h)
+            x += w + 1
+            row_height = max(row_height, h)
+        atlas_height = y + row_height
+
+        atlas = pygame.Surface((atlas_width, atlas_height), pygame.SRCALPHA)
+        atlas.fill((0, 0, 0, 0))
+        for char, surface in glyph_surfaces.items():
+            atlas.blit(surface, positions[char][:2])
+
+        # Guardar coordenadas de textura y tamaño de cada glifo
+        self.glyphs = {}
+        for char, (gx, gy, w, h) in positions.items():
+            self.glyphs[char] = (
+                gx / atlas_width, gy / atlas_height,
+                (gx + w) / atlas_width, (gy + h) / atlas_height,
+                w, h
+            )
+
+        # Subir atlas (la primera fila de la superficie queda en v = 0)
+        pixels = pygame.image.tostring(atlas, "RGBA", False)
+        self.atlas_texture = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D, self.atlas_texture)
+        glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA8, atlas_width, atlas_height, 0,
+                     GL_RGBA, GL_UNSIGNED_BYTE, pixels)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
+        glBindTexture(GL_TEXTURE_2D, 0)
+
+    def setup_buffers(self):
+        """VAO que lee los vértices del HUD desde el buffer circular"""
+        self.vao = glGenVertexArrays(1)
+        glBindVertexArray(self.vao)
+        glBindBuffer(GL_ARRAY_BUFFER, self.stream_buffer.buffer)
+
+        item = np.dtype(np.float32).itemsize
+        # Posición (location 0)
+        glEnableVertexAttribArray(0)
+        glVertexAttribPointer(0, 2, GL_FLOAT, GL_FALSE, HUD_VERTEX_STRIDE, ctypes.c_void_p(0))
+        # Coordenadas de textura (location 1)
+        glEnableVertexAttribArray(1)
+        glVertexAttribPointer(1, 2, GL_FLOAT, GL_FALSE, HUD_VERTEX_STRIDE, ctypes.c_void_p(2 * item))
+        # Color (location 2)
+        glEnableVertexAttribArray(2)
+        glVertexAttribPointer(2, 4, GL_FLOAT, GL_FALSE, HUD_VERTEX_STRIDE, ctypes.c_void_p(4 * item))
+
+        glBindVertexArray(0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def set_text(self, slot, text, x, y, color=(1.0, 1.0, 1.0, 1.0)):
+        """Asignar el texto de un slot; solo se tesela de nuevo si algo cambió"""
+        current = self.slots.get(slot)
+        if (current is not None and current['text'] == text and
+                current['x'] == x and current['y'] == y and current['color'] == color):
+            return
+
+        self.slots[slot] = {
+            'text': text,
+            'x': x,
+            'y': y,
+            'color': color,
+            'vertices': self._tessellate(text, x, y, color)
+        }
+        self.stats['retessellations'] += 1
+        self.batch_dirty = True
+
+    def remove_text(self, slot):
+        """Quitar un slot del HUD"""
+        if self.slots.pop(slot, None) is not None:
+            self.batch_dirty = True
+
+    def _tessellate(self, text, x, y, color):
+        """Generar dos triángulos por carácter (posición en píxeles)"""
+        r, g, b, a = color
+        vertices = []
+        pen_x = x
+        for char in text:
+            glyph = self.glyphs.get(char, self.glyphs['?'])
+            u0, v0, u1, v1, w, h = glyph
+            x0, y0, x1, y1 = pen_x, y, pen_x + w, y + h
+            vertices.extend([
+                x0, y0, u0, v0, r, g, b, a,
+                x1, y0, u1, v0, r, g, b, a,
+                x1, y1, u1, v1, r, g, b, a,
+                x1, y1, u1, v1, r, g, b, a,
+                x0, y1, u0, v1, r, g, b, a,
+                x0, y0, u0, v0, r, g, b, a
+            ])
+            pen_x += w
+        return np.array(vertices, dtype=np.float32)
+
+    def draw(self):
+        """Dibujar todos los slots con una sola llamada de dibujo"""
+        if self.batch_dirty:
+            parts = [slot['vertices'] for slot in self.slots.values() if slot['vertices'].size]
+            self.batch = np.concatenate(parts) if parts else None
+            self.batch_dirty = False
+
+        if self.batch is None:
+            return
+
+        # Alinear al stride para poder usar el offset como primer vértice
+        offset = self.stream_buffer.allocate(self.batch, alignment=HUD_VERTEX_STRIDE)
+        if offset is None:
+            return
+
+        self.shader.use()
+        self.shader.set_vec2("screenSize", (float(self.width), float(self.height)))
+        self.shader.set_int("glyphAtlas", 0)
+
+        self.state.bind_texture(GL_TEXTURE_2D, self.atlas_texture)
+
+        self.state.set_capability(GL_DEPTH_TEST, False)
+        self.state.set_capability(GL_BLEND, True)
+        self.state.blend_func(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+
+        self.state.bind_vertex_array(self.vao)
+        glDrawArrays(GL_TRIANGLES, offset // HUD_VERTEX_STRIDE,
+                     len(self.batch) // HUD_VERTEX_FLOATS)
+        self.stats['draw_calls'] += 1
+
+        self.state.set_capability(GL_BLEND, False)
+        self.state.set_capability(GL_DEPTH_TEST, True)
+
+    def cleanup(self):
+        """Liberar textura, VAO y shader del HUD"""
+        if self.atlas_texture:
+            glDeleteTextures([self.atlas_texture])
+            self.atlas_texture = None
+        if self.vao:
+            glDeleteVertexArrays(1, [self.vao])
+            self.vao = None
+        self.shader.cleanup()
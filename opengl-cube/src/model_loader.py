@@ -4,7 +4,7 @@ import numpy as np
 import ctypes
 from OpenGL.GL import *
 # Importar funciones específicas de VBO/VAO
-from OpenGL.GL import glGenBuffers, glBindBuffer, glBufferData, glGenVertexArrays, glBindVertexArray, glEnableVertexAttribArray, glVertexAttribPointer, glDeleteBuffers, glDeleteVertexArrays, GL_ARRAY_BUFFER, GL_ELEMENT_ARRAY_BUFFER, GL_STATIC_DRAW, GL_FLOAT, GL_UNSIGNED_INT, GL_TRIANGLES, glDrawElements
+from OpenGL.GL import glGenBuffers, glBindBuffer, glBufferData, glGenVertexArrays, glBindVertexArray, glEnableVertexAttribArray, glVertexAttribPointer, glDeleteBuffers, glDeleteVertexArrays, GL_ARRAY_BUFFER, GL_ELEMENT_ARRAY_BUFFER, GL_STATIC_DRAW, GL_FLOAT
 from pyassimp.errors import AssimpError # Importar explícitamente
 
 class ModelLoader:
@@ -135,15 +135,8 @@ class ModelLoader:
     def set_rotation(self, x, y, z):
         self.model_rotation = [x, y, z]
     
-    def draw(self):
-        """Renderizar el modelo (el shader y las matrices ya deben estar configurados)"""
-        if not self.meshes_gl:
-            return
-        
-        # Con OpenGL Core Profile, las transformaciones se hacen vía uniforms en el shader
-        # así que no necesitamos glPushMatrix/glTranslate/etc aquí
-        
+    def submit(self, render_queue, shader, model, color):
+        """Encolar cada malla del modelo en una RenderQueue; el dibujo lo hace
+        quien vacía la cola, agrupando por programa y VAO"""
         for mesh_gl in self.meshes_gl:
-            glBindVertexArray(mesh_gl['vao'])
-            glDrawElements(GL_TRIANGLES, mesh_gl['index_count'], GL_UNSIGNED_INT, None)
-            glBindVertexArray(0) 
\ No newline at end of file
+            render_queue.submit(shader, mesh_gl['vao'], mesh_gl['index_count'], model, color)
@@ -0,0 +1,135 @@
+from OpenGL.GL import *
+
+class GLStateCache:
+    """Caché del estado de OpenGL para evitar llamadas redundantes.
+
+    Recuerda el programa, VAO, buffers, texturas y capacidades activas y solo
+    llama a OpenGL cuando el valor cambia. Cuenta los cambios reales y los
+    que se evitaron en cada frame.
+    """
+
+    def __init__(self):
+        self.invalidate()
+        self.stats = {
+            'program_changes': 0,
+            'vao_changes': 0,
+            'buffer_changes': 0,
+            'texture_changes': 0,
+            'capability_changes': 0,
+            'blend_func_changes': 0,
+            'redundant_skipped': 0
+        }
+        self.last_frame_stats = dict(self.stats)
+
+    def invalidate(self):
+        """Olvidar el estado conocido (p. ej. tras código que llama a GL directamente)"""
+        self.program = None
+        self.vao = None
+        self.buffers = {}
+        self.textures = {}
+        self.capabilities = {}
+        self.blend = None
+
+    def begin_frame(self):
+        """Guardar contadores del frame anterior y reiniciarlos"""
+        self.last_frame_stats = dict(self.stats)
+        for key in self.stats:
+            self.stats[key] = 0
+        # Al inicio del frame no confiamos en el estado que dejó otro código
+        self.invalidate()
+
+    def state_changes(self):
+        """Total de cambios de estado reales en el frame anterior"""
+        return sum(value for key, value in self.last_frame_stats.items() if key != 'redundant_skipped')
+
+    def use_program(self, program):
+        if self.program == program:
+            self.stats['redundant_skipped'] += 1
+            return
+        glUseProgram(program)
+        self.program = program
+        self.stats['program_changes'] += 1
+
+    def bind_vertex_array(self, vao):
+        if self.vao == vao:
+            self.stats['redundant_skipped'] += 1
+            return
+        glBindVertexArray(vao)
+        self.vao = vao
+        self.stats['vao_changes'] += 1
+
+    def bind_buffer(self, target, buffer):
+        if self.buffers.get(target) == buffer:
+            self.stats['redundant_skipped'] += 1
+            return
+        glBindBuffer(target, buffer)
+        self.buffers[target] = buffer
+        self.stats['buffer_changes'] += 1
+
+    def bind_texture(self, target, texture, unit=0):
+        if self.textures.get((unit, target)) == texture:
+            self.stats['redundant_skipped'] += 1
+            return
+        glActiveTexture(GL_TEXTURE0 + unit)
+        glBindTexture(target, texture)
+        self.textures[(unit, target)] = texture
+        self.stats['texture_changes'] += 1
+
+    def set_capability(self, capability, enabled):
+        if self.capabilities.get(capability) == enabled:
+            self.stats['redundant_skipped'] += 1
+            return
+        if enabled:
+            glEnable(capability)
+        else:
+            glDisable(capability)
+        self.capabilities[capability] = enabled
+        self.stats['capability_changes'] += 1
+
+    def blend_func(self, src, dst):
+        if self.blend == (src, dst):
+            self.stats['redundant_skipped'] += 1
+            return
+        glBlendFunc(src, dst)
+        self.blend = (src, dst)
+        self.stats['blend_func_changes'] += 1
+
+
+class RenderQueue:
+    """Cola de comandos de dibujo del frame, ordenada por estado antes de ejecutarse"""
+
+    def __init__(self):
+        self.commands = []
+
+    def submit(self, shader, vao, index_count, model, color):
+        """Añadir un comando de dibujo indexado"""
+        self.commands.append({
+            'key': (shader.program, vao, color),
+            'shader': shader,
+            'vao': vao,
+            'index_count': index_count,
+            'model': model,
+            'color': color,
+            'batch': None
+        })
+
+    def submit_batch(self, shader, vao, draw):
+        """Añadir un lote que se dibuja con `draw(shader)` una vez activos su
+        programa y VAO (p. ej. los cubos con transformaciones precalculadas)"""
+        self.commands.append({
+            'key': (shader.program, vao, ()),
+            'shader': shader,
+            'vao': vao,
+            'batch': draw
+        })
+
+    def sorted_commands(self):
+        """Comandos agrupados por programa, VAO y color"""
+        self.commands.sort(key=lambda command: command['key'])
+        return self.commands
+
+    def clear(self):
+        self.commands.clear()
+
+    def __len__(self):
+        return len(self.commands)
@@ -6,8 +6,12 @@ import glm
 class ShaderLoader:
     """Clase para cargar y gestionar programas de shader OpenGL"""
     
-    def __init__(self):
+    def __init__(self, state_cache=None):
         self.program = None
+        # GLStateCache opcional para evitar glUseProgram redundantes
+        self.state_cache = state_cache
+        # Ubicaciones de uniforms ya consultadas (evita glGetUniformLocation por frame)
+        self.uniform_locations = {}
         
     def load_shader(self, vertex_file_path, fragment_file_path):
         """Cargar y compilar shaders desde archivos"""
@@ -32,6 +36,7 @@ class ShaderLoader:
         
         # Crear programa de shader
         self.program = glCreateProgram()
+        self.uniform_locations = {}
         glAttachShader(self.program, vertex_shader)
         glAttachShader(self.program, fragment_shader)
         glLinkProgram(self.program)
@@ -58,37 +63,57 @@ class ShaderLoader:
     
     def use(self):
         """Activar programa de shader"""
-        glUseProgram(self.program)
+        if self.state_cache is not None:
+            self.state_cache.use_program(self.program)
+        else:
+            glUseProgram(self.program)
+    
+    def uniform_location(self, name):
+        """Ubicación de un uniform, consultada a OpenGL solo la primera vez"""
+        loc = self.uniform_locations.get(name)
+        if loc is None:
+            loc = glGetUniformLocation(self.program, name)
+            self.uniform_locations[name] = loc
+        return loc
     
     def set_bool(self, name, value):
         """Establecer uniform boolean"""
-        glUniform1i(glGetUniformLocation(self.program, name), int(value))
+        glUniform1i(self.uniform_location(name), int(value))
     
     def set_int(self, name, value):
         """Establecer uniform int"""
-        glUniform1i(glGetUniformLocation(self.program, name), value)
+        glUniform1i(self.uniform_location(name), value)
     
     def set_float(self, name, value):
         """Establecer uniform float"""
-        glUniform1f(glGetUniformLocation(self.program, name), value)
+        glUniform1f(self.uniform_location(name), value)
+    
+    def set_vec2(self, name, value):
+        """Establecer uniform vec2"""
+        if isinstance(value, (list, tuple)):
+            glUniform2f(self.uniform_location(name), value[0], value[1])
+        else:  # Asumimos que es un glm.vec2
+            glUniform2f(self.uniform_location(name), value.x, value.y)
     
     def set_vec3(self, name, value):
         """Establecer uniform vec3"""
         if isinstance(value, (list, tuple)):
-            glUniform3f(glGetUniformLocation(self.program, name), value[0], value[1], value[2])
+            glUniform3f(self.uniform_location(name), value[0], value[1], value[2])
         else:  # Asumimos que es un glm.vec3
-            glUniform3f(glGetUniformLocation(self.program, name), value.x, value.y, value.z)
+            glUniform3f(self.uniform_location(name), value.x, value.y, value.z)
     
     def set_mat4(self, name, mat):
         """Establecer uniform mat4"""
         # Flatten para convertir a array 1D y transponerla para OpenGL (column-major)
-        loc = glGetUniformLocation(self.program, name)
+        loc = self.uniform_location(name)
         if isinstance(mat, list):  # Handle Python lists
             flat_mat = []
             for col in range(4):
                 for row in range(4):
                     flat_mat.append(mat[row][col])
             glUniformMatrix4fv(loc, 1, GL_FALSE, flat_mat)
+        elif isinstance(mat, np.ndarray):  # 16 floats ya en orden column-major
+            glUniformMatrix4fv(loc, 1, GL_FALSE, mat)
         else:  # Asumimos que es una matriz de glm
             glUniformMatrix4fv(loc, 1, GL_FALSE, glm.value_ptr(mat))
     
@@ -0,0 +1,15 @@
+#version 330 core
+
+in vec2 TexCoord;
+in vec4 Color;
+
+out vec4 FragColor;
+
+// Atlas de glifos (blanco con alfa)
+uniform sampler2D glyphAtlas;
+
+void main()
+{
+    float alpha = texture(glyphAtlas, TexCoord).a;
+    FragColor = vec4(Color.rgb, Color.a * alpha);
+}
@@ -0,0 +1,23 @@
+#version 330 core
+
+// Posición en píxeles (origen arriba-izquierda), coordenadas del atlas y color
+layout (location = 0) in vec2 aPos;
+layout (location = 1) in vec2 aTexCoord;
+layout (location = 2) in vec4 aColor;
+
+// Tamaño de la ventana en píxeles
+uniform vec2 screenSize;
+
+out vec2 TexCoord;
+out vec4 Color;
+
+void main()
+{
+    // Convertir píxeles a coordenadas normalizadas
+    vec2 ndc = vec2(aPos.x / screenSize.x * 2.0 - 1.0,
+                    1.0 - aPos.y / screenSize.y * 2.0);
+    gl_Position = vec4(ndc, 0.0, 1.0);
+    
+    TexCoord = aTexCoord;
+    Color = aColor;
+}
@@ -0,0 +1,16 @@
+#version 330 core
+
+in vec2 TexCoord;
+
+out vec4 FragColor;
+
+// Textura con el modelo de fondo ya iluminado
+uniform sampler2D impostorTexture;
+
+void main()
+{
+    vec4 color = texture(impostorTexture, TexCoord);
+    if (color.a < 0.01)
+        discard;
+    FragColor = color;
+}
@@ -0,0 +1,25 @@
+#version 330 core
+
+// Esquinas del quad en coordenadas normalizadas [-1, 1]
+layout (location = 0) in vec2 aPos;
+
+// Rotación del fondo en Z (radianes), relación de aspecto de la ventana
+// y extensión en NDC que cubre la textura horneada
+uniform float angle;
+uniform float aspect;
+uniform float extent;
+
+out vec2 TexCoord;
+
+void main()
+{
+    TexCoord = aPos * 0.5 + 0.5;
+    
+    // Rotar en espacio con aspecto corregido para que la imagen no se deforme
+    vec2 p = aPos * extent * vec2(aspect, 1.0);
+    float c = cos(angle);
+    float s = sin(angle);
+    p = vec2(c * p.x - s * p.y, s * p.x + c * p.y);
+    
+    gl_Position = vec4(p.x / aspect, p.y, 0.0, 1.0);
+}
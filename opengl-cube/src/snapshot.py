@@ -0,0 +1,180 @@
+"""Snapshots binarios compactos del estado de SnakeGame.
+
+Formato (little-endian):
+    cabecera   magic, tamaño del tablero, puntaje, game over, dirección,
+               comida, número de segmentos y cabeza
+    rng        versión, 625 enteros de 32 bits y gauss_next de random.Random
+    cuerpo     2 bits por segmento: dirección desde el segmento anterior
+
+SnapshotRing guarda el rng aparte para compartirlo entre snapshots.
+
+El cuerpo siempre es una cadena de celdas vecinas (con vuelta en los bordes),
+así que la ocupación del tablero se reconstruye a partir de la cabeza y los
+deltas sin guardar un mapa de bits aparte.
+"""
+import collections
+import struct
+import numpy as np
+
+SNAPSHOT_MAGIC = b'SNK1'
+
+# magic, board_size, score, game_over, dir_x, dir_y, food_x, food_y, length, head_x, head_y
+HEADER = struct.Struct('<4sHIBbbHHIHH')
+RNG_STATE = struct.Struct('<B625I')
+RNG_GAUSS = struct.Struct('<Bd')
+
+# Código de 2 bits -> delta entre segmentos consecutivos
+DELTAS = np.array([[1, 0], [-1, 0], [0, 1], [0, -1]], dtype=np.int64)
+
+def _encode_body(snake, size):
+    """Empaquetar los deltas del cuerpo a 2 bits por segmento"""
+    body = np.asarray(snake, dtype=np.int64)
+    deltas = (body[1:] - body[:-1]) % size
+
+    codes = np.full(len(deltas), 255, dtype=np.uint8)
+    codes[(deltas[:, 0] == 1) & (deltas[:, 1] == 0)] = 0
+    codes[(deltas[:, 0] == size - 1) & (deltas[:, 1] == 0)] = 1
+    codes[(deltas[:, 0] == 0) & (deltas[:, 1] == 1)] = 2
+    codes[(deltas[:, 0] == 0) & (deltas[:, 1] == size - 1)] = 3
+    if (codes == 255).any():
+        raise ValueError("El cuerpo de la serpiente no es una cadena de celdas vecinas")
+
+    # Rellenar a múltiplo de 4 y juntar cuatro códigos por byte
+    codes = np.concatenate([codes, np.zeros(-len(codes) % 4, dtype=np.uint8)]).reshape(-1, 4)
+    packed = (codes[:, 0] << 6) | (codes[:, 1] << 4) | (codes[:, 2] << 2) | codes[:, 3]
+    return packed.astype(np.uint8).tobytes()
+
+def _decode_body(data, head, length, size):
+    """Reconstruir la lista de segmentos a partir de la cabeza y los deltas"""
+    packed = np.frombuffer(data, dtype=np.uint8)
+    codes = np.stack([packed >> 6, (packed >> 4) & 3, (packed >> 2) & 3, packed & 3], axis=1)
+    codes = codes.reshape(-1)[:length - 1]
+
+    body = np.empty((length, 2), dtype=np.int64)
+    body[0] = head
+    body[1:] = (np.asarray(head, dtype=np.int64) + np.cumsum(DELTAS[codes], axis=0)) % size
+    return body.tolist()
+
+def _pack_header(game):
+    head = game.snake[0]
+    return HEADER.pack(SNAPSHOT_MAGIC, game.board_size, game.score, game.game_over,
+                       game.direction[0], game.direction[1],
+                       game.food[0], game.food[1],
+                       len(game.snake), head[0], head[1])
+
+def _pack_rng(rng):
+    """Estado de random.Random: 625 enteros más gauss_next"""
+    version, internal, gauss_next = rng.getstate()
+    return (RNG_STATE.pack(version, *internal) +
+            RNG_GAUSS.pack(gauss_next is not None, gauss_next or 0.0))
+
+def _unpack_rng(rng, data, offset):
+    """Restaurar el RNG desde `data`; devuelve el offset siguiente"""
+    rng_values = RNG_STATE.unpack_from(data, offset)
+    offset += RNG_STATE.size
+    has_gauss, gauss = RNG_GAUSS.unpack_from(data, offset)
+    offset += RNG_GAUSS.size
+    rng.setstate((rng_values[0], rng_values[1:], gauss if has_gauss else None))
+    return offset
+
+def _restore_state(game, data, body_offset):
+    """Restaurar cabecera y cuerpo; el RNG se restaura aparte"""
+    (magic, size, score, game_over, dir_x, dir_y,
+     food_x, food_y, length, head_x, head_y) = HEADER.unpack_from(data, 0)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError("Los datos no son un snapshot de SnakeGame")
+
+    game.board_size = size
+    game.score = score
+    game.game_over = bool(game_over)
+    game.direction = [dir_x, dir_y]
+    game.food = [food_x, food_y]
+    game.snake = _decode_body(data[body_offset:], [head_x, head_y], length, size)
+    return game
+
+def save_snapshot(game):
+    """Serializar el estado completo del juego a bytes"""
+    return b''.join([_pack_header(game), _pack_rng(game.rng),
+                     _encode_body(game.snake, game.board_size)])
+
+def restore_snapshot(game, data):
+    """Restaurar en `game` el estado guardado con save_snapshot"""
+    if data[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+        raise ValueError("Los datos no son un snapshot de SnakeGame")
+    body_offset = _unpack_rng(game.rng, data, HEADER.size)
+    return _restore_state(game, data, body_offset)
+
+def fork_game(game, snapshot=None):
+    """Crear una copia headless e independiente del juego (p. ej. para búsqueda)
+
+    Sin `snapshot` se copia el estado en memoria directamente, que es más
+    barato que pasar por bytes.
+    """
+    # type(game) evita reimportar main.py cuando se ejecuta como __main__
+    fork = type(game)(0, 0, headless=True, board_size=game.board_size)
+    if snapshot is not None:
+        return restore_snapshot(fork, snapshot)
+
+    fork.snake = [list(segment) for segment in game.snake]
+    fork.direction = list(game.direction)
+    fork.food = list(game.food)
+    fork.score = game.score
+    fork.game_over = game.game_over
+    fork.rng.setstate(game.rng.getstate())
+    return fork
+
+class SnapshotRing:
+    """Anillo en memoria con los últimos snapshots para rebobinar al instante.
+
+    El RNG solo avanza al generar comida, así que los snapshots consecutivos
+    comparten el mismo bloque con su estado (unos 2.5 KB) en lugar de
+    serializarlo en cada tick.
+    """
+
+    def __init__(self, capacity=256):
+        self.snapshots = collections.deque(maxlen=capacity)  # (rng, cabecera + cuerpo)
+        self.rng_key = None
+        self.rng_data = None
+
+    def push(self, game):
+        """Guardar el estado actual del juego"""
+        # Puntaje y comida cambian cada vez que se genera comida nueva
+        key = (game.score, game.food[0], game.food[1])
+        if key != self.rng_key:
+            self.rng_data = _pack_rng(game.rng)
+            self.rng_key = key
+        state = _pack_header(game) + _encode_body(game.snake, game.board_size)
+        self.snapshots.append((self.rng_data, state))
+
+    def rewind(self, game, steps=1):
+        """Volver `steps` estados atrás; devuelve False si no hay tantos guardados"""
+        if steps < 1 or steps > len(self.snapshots):
+            return False
+        for _ in range(steps - 1):
+            self.snapshots.pop()
+        rng_data, state = self.snapshots.pop()
+        _unpack_rng(game.rng, rng_data, 0)
+        _restore_state(game, state, HEADER.size)
+        # El RNG del juego ya no corresponde al bloque compartido
+        self.rng_key = None
+        return True
+
+    def latest(self):
+        """Último snapshot en el formato de save_snapshot"""
+        if not self.snapshots:
+            return None
+        rng_data, state = self.snapshots[-1]
+        return state[:HEADER.size] + rng_data + state[HEADER.size:]
+
+    def clear(self):
+        self.snapshots.clear()
+        self.rng_key = None
+        self.rng_data = None
+
+    def __len__(self):
+        return len(self.snapshots)
+
+    def nbytes(self):
+        """Memoria ocupada por los snapshots guardados (cada bloque de RNG una vez)"""
+        rng_blocks = {id(rng_data): len(rng_data) for rng_data, _ in self.snapshots}
+        return sum(len(state) for _, state in self.snapshots) + sum(rng_blocks.values())
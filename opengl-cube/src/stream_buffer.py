@@ -0,0 +1,127 @@
+import ctypes
+import time
+import numpy as np
+from OpenGL.GL import *
+
+class StreamBuffer:
+    """Buffer circular para subir datos dinámicos cada frame sin reasignar memoria.
+
+    El buffer se divide en `frames` regiones (triple buffer por defecto). Cada
+    frame escribe en su propia región mediante glMapBufferRange sin
+    sincronizar, y un fence al terminar el frame protege esa región hasta que
+    la GPU deja de leerla.
+    """
+
+    def __init__(self, region_size=1024 * 1024, frames=3, target=GL_ARRAY_BUFFER, state_cache=None):
+        self.region_size = region_size
+        self.state_cache = state_cache
+        self.frames = frames
+        self.target = target
+
+        # Un único buffer con espacio para todas las regiones
+        self.buffer = glGenBuffers(1)
+        glBindBuffer(self.target, self.buffer)
+        glBufferData(self.target, self.region_size * self.frames, None, GL_STREAM_DRAW)
+        glBindBuffer(self.target, 0)
+
+        self.fences = [None] * self.frames
+        self.frame_index = 0
+        self.region = 0
+        self.offset = 0
+        self.overflow_warned = False
+
+        self.stats = {
+            'bytes_streamed': 0,
+            'frame_bytes': 0,
+            'last_frame_bytes': 0,
+            'allocations': 0,
+            'overflows': 0,
+            'map_failures': 0,
+            'fence_waits': 0,
+            'fence_wait_ms': 0.0
+        }
+
+    def begin_frame(self):
+        """Seleccionar la región del frame y esperar si la GPU todavía la usa"""
+        self.region = self.frame_index % self.frames
+        self.offset = 0
+        self.stats['last_frame_bytes'] = self.stats['frame_bytes']
+        self.stats['frame_bytes'] = 0
+
+        fence = self.fences[self.region]
+        if fence is not None:
+            start = time.perf_counter()
+            status = glClientWaitSync(fence, GL_SYNC_FLUSH_COMMANDS_BIT, 0)
+            if status not in (GL_ALREADY_SIGNALED, GL_CONDITION_SATISFIED):
+                # La GPU va retrasada: bloquear hasta que libere la región
+                self.stats['fence_waits'] += 1
+                while status not in (GL_ALREADY_SIGNALED, GL_CONDITION_SATISFIED, GL_WAIT_FAILED):
+                    status = glClientWaitSync(fence, GL_SYNC_FLUSH_COMMANDS_BIT, 1000000)  # 1 ms
+                self.stats['fence_wait_ms'] += (time.perf_counter() - start) * 1000.0
+            glDeleteSync(fence)
+            self.fences[self.region] = None
+
+    def allocate(self, data, alignment=16):
+        """Copiar `data` (array de NumPy) a la región del frame actual.
+
+        Devuelve el offset en bytes dentro del buffer para usarlo en
+        glVertexAttribPointer / glDrawArrays, o None si está vacío, no cabe o
+        no se pudo mapear el buffer.
+        """
+        data = np.ascontiguousarray(data)
+        size = data.nbytes
+        if size == 0:
+            # glMapBufferRange no acepta rangos vacíos
+            return None
+
+        aligned = (self.offset + alignment - 1) // alignment * alignment
+        if aligned + size > self.region_size:
+            self.stats['overflows'] += 1
+            if not self.overflow_warned:
+                # Avisar una sola vez; el resto queda en stats['overflows']
+                print(f"Advertencia: StreamBuffer lleno ({aligned + size} > {self.region_size} bytes)")
+                self.overflow_warned = True
+            return None
+
+        offset = self.region * self.region_size + aligned
+
+        if self.state_cache is not None:
+            self.state_cache.bind_buffer(self.target, self.buffer)
+        else:
+            glBindBuffer(self.target, self.buffer)
+        ptr = glMapBufferRange(self.target, offset, size,
+                               GL_MAP_WRITE_BIT | GL_MAP_UNSYNCHRONIZED_BIT |
+                               GL_MAP_INVALIDATE_RANGE_BIT)
+        if not ptr:
+            # Error de GL o sin memoria: copiar a NULL tumbaría el proceso
+            self.stats['map_failures'] += 1
+            if self.state_cache is not None:
+                self.state_cache.bind_buffer(self.target, 0)
+            else:
+                glBindBuffer(self.target, 0)
+            return None
+        # __array_interface__ en lugar de data.ctypes, que crea un ciclo de
+        # referencias por llamada y deja basura hasta que pasa el gc
+        ctypes.memmove(ptr, data.__array_interface__['data'][0], size)
+        glUnmapBuffer(self.target)
+
+        self.offset = aligned + size
+        self.stats['bytes_streamed'] += size
+        self.stats['frame_bytes'] += size
+        self.stats['allocations'] += 1
+        return offset
+
+    def end_frame(self):
+        """Insertar un fence tras los comandos que leen la región del frame"""
+        self.fences[self.region] = glFenceSync(GL_SYNC_GPU_COMMANDS_COMPLETE, 0)
+        self.frame_index += 1
+
+    def cleanup(self):
+        """Liberar fences y buffer"""
+        for fence in self.fences:
+            if fence is not None:
+                glDeleteSync(fence)
+        self.fences = [None] * self.frames
+        if self.buffer:
+            glDeleteBuffers(1, [self.buffer])
+            self.buffer = None
@@ -0,0 +1,216 @@
+"""Los frames en régimen estable no deben acumular memoria en Python.
+
+OpenGL se sustituye por funciones vacías (no hace falta contexto GL) solo
+mientras dura el test: lo que se mide es la parte Python de SnakeGame.render,
+desde begin_frame hasta end_frame (fondo, cubos, HUD y cola de dibujo).
+"""
+import ctypes
+import gc
+import importlib
+import itertools
+import math
+import os
+import re
+import sys
+import tracemalloc
+import types
+import unittest
+from unittest import mock
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+FRAMES = 1000
+SEGMENTS = 200
+MAX_BYTES = 16 * 1024  # Margen para el propio tracemalloc
+MAX_FRAME_PEAK = 16 * 1024  # El HUD re-teselado ronda 10 KB; un objeto por cubo pasaría de ~30 KB
+
+# Memoria que devuelve el glMapBufferRange falso (cabe una región del StreamBuffer)
+MAPPED_MEMORY = ctypes.create_string_buffer(1024 * 1024)
+
+def _noop(*args, **kwargs):
+    return 1
+
+def _map_buffer_range(target, offset, size, access):
+    return ctypes.addressof(MAPPED_MEMORY)
+
+def _gl_stub():
+    """Módulos OpenGL y OpenGL.GL falsos con todos los nombres gl*/GL_* usados en src/"""
+    names = set()
+    src_dir = os.path.join(ROOT, 'src')
+    for file_name in os.listdir(src_dir):
+        if file_name.endswith('.py'):
+            with open(os.path.join(src_dir, file_name)) as source:
+                names.update(re.findall(r'\b(?:gl[A-Z]\w*|GL_\w+)\b', source.read()))
+
+    gl = types.ModuleType('OpenGL.GL')
+    for name in names:
+        setattr(gl, name, 1 if name.startswith('GL_') else _noop)
+    gl.glMapBufferRange = _map_buffer_range
+    gl.__all__ = sorted(names)
+
+    opengl = types.ModuleType('OpenGL')
+    opengl.GL = gl
+    return {'OpenGL': opengl, 'OpenGL.GL': gl}
+
+def _stub_if_missing(modules, name, **attributes):
+    try:
+        importlib.import_module(name)
+    except ImportError:
+        module = types.ModuleType(name)
+        for key, value in attributes.items():
+            setattr(module, key, value)
+        modules[name] = module
+
+def _fake_modules():
+    modules = _gl_stub()
+    _stub_if_missing(modules, 'pygame')
+    _stub_if_missing(modules, 'glm', radians=math.radians)
+    _stub_if_missing(modules, 'pyassimp')
+    _stub_if_missing(modules, 'pyassimp.postprocess')
+    _stub_if_missing(modules, 'pyassimp.errors', AssimpError=type('AssimpError', (Exception,), {}))
+    return modules
+
+class FakeClock:
+    """Reloj de pygame cuyo FPS cambia cada frame para forzar el re-teselado del HUD"""
+
+    def __init__(self):
+        self.fps = itertools.cycle((9.0, 10.0, 11.0))
+
+    def get_fps(self):
+        return next(self.fps)
+
+class RenderAllocationTest(unittest.TestCase):
+
+    def setUp(self):
+        # OpenGL falso solo durante este test; al terminar se restaura sys.modules
+        # (incluidos main y src.*, que se vuelven a importar con el stub)
+        patcher = mock.patch.dict(sys.modules, _fake_modules())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        for name in list(sys.modules):
+            if name == 'main' or name.startswith('src.'):
+                del sys.modules[name]
+
+        self.main = importlib.import_module('main')
+        game_renderer = importlib.import_module('src.game_renderer')
+        flip = mock.patch.object(game_renderer, 'pygame',
+                                 types.SimpleNamespace(display=types.SimpleNamespace(flip=_noop)))
+        flip.start()
+        self.addCleanup(flip.stop)
+
+    def make_renderer(self):
+        """GameRenderer sin ventana, con el estado que usa SnakeGame.render"""
+        GameRenderer = importlib.import_module('src.game_renderer').GameRenderer
+        GLStateCache = importlib.import_module('src.render_state').GLStateCache
+        RenderQueue = importlib.import_module('src.render_state').RenderQueue
+        ShaderLoader = importlib.import_module('src.shader_loader').ShaderLoader
+        StreamBuffer = importlib.import_module('src.stream_buffer').StreamBuffer
+        HudRenderer = importlib.import_module('src.hud_renderer').HudRenderer
+
+        renderer = GameRenderer.__new__(GameRenderer)
+        renderer.width = 800
+        renderer.height = 600
+        renderer.state = GLStateCache()
+        renderer.render_queue = RenderQueue()
+        renderer.shader = ShaderLoader(renderer.state)
+        renderer.shader.program = 1
+        renderer.view = np.identity(4, dtype=np.float32).reshape(-1)
+        renderer.projection = np.identity(4, dtype=np.float32).reshape(-1)
+        renderer.light_pos = (5.0, 5.0, 5.0)
+        renderer.view_pos = (0.0, 0.0, 3.0)
+        renderer.cube_vao = 1
+        renderer.setup_cube_batch(20 * 20)
+
+        # Fondo como impostor ya horneado (el horneado necesita glm real)
+        renderer.background_rotation_z = 0
+        renderer.models = {'background_camera': object()}
+        renderer.impostor_shader = ShaderLoader(renderer.state)
+        renderer.impostor_shader.program = 3
+        renderer.impostor_vao = 3
+        impostor = {'fbo': 1, 'texture': 1, 'depth_rbo': 1, 'size': (1, 1),
+                    'key': None, 'unsupported': False}
+        renderer.background_impostors = {}
+        renderer._bake_background_impostor = lambda *args: impostor
+
+        renderer.stream_buffer = StreamBuffer(state_cache=renderer.state)
+
+        # HUD sin fuente de pygame: todos los glifos del mismo tamaño
+        hud = HudRenderer.__new__(HudRenderer)
+        hud.stream_buffer = renderer.stream_buffer
+        hud.state = renderer.state
+        hud.width = renderer.width
+        hud.height = renderer.height
+        hud.slots = {}
+        hud.batch = None
+        hud.batch_dirty = False
+        hud.stats = {'retessellations': 0, 'draw_calls': 0}
+        hud.shader = ShaderLoader(renderer.state)
+        hud.shader.program = 2
+        hud.glyphs = {chr(code): (0.0, 0.0, 0.1, 0.1, 8, 16) for code in range(32, 127)}
+        hud.line_height = 16
+        hud.atlas_texture = 1
+        hud.vao = 2
+        renderer.hud = hud
+        return renderer
+
+    def make_game(self, renderer):
+        """SnakeGame headless al que se le conecta el renderer falso"""
+        SnakeGame = self.main.SnakeGame
+        FrameScheduler = importlib.import_module('src.frame_scheduler').FrameScheduler
+
+        game = SnakeGame(0, 0, headless=True, seed=1, board_size=20)
+        game.game = renderer
+        game.has_background_model = True
+        game.clock = FakeClock()
+        game.scheduler = FrameScheduler(game.clock)
+        game.show_stats = False
+        game.paused = False
+        game.focused = True
+        game.minimized = False
+        game.snake = [[i % 20, i // 20] for i in range(SEGMENTS)]
+        game.food = [19, 19]
+        return game
+
+    def test_steady_state_frames_allocate_almost_nothing(self):
+        renderer = self.make_renderer()
+        game = self.make_game(renderer)
+
+        tracemalloc.start()
+        try:
+            # Calentar cachés (ubicaciones de uniforms, paleta de colores, slots
+            # del HUD) ya con tracemalloc, para que los arrays que se reemplazan
+            # cada frame estén medidos también en la foto inicial
+            for _ in range(50):
+                game.render()
+            gc.collect()
+            retessellations = renderer.hud.stats['retessellations']
+
+            before = tracemalloc.take_snapshot()
+            baseline = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            for _ in range(FRAMES):
+                game.render()
+            peak = tracemalloc.get_traced_memory()[1] - baseline
+            after = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+
+        growth = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+        self.assertLess(growth, MAX_BYTES,
+                        f"{FRAMES} frames acumularon {growth} bytes")
+        # Tampoco basura temporal por cubo dentro de un frame
+        self.assertLess(peak, MAX_FRAME_PEAK,
+                        f"Pico de {peak} bytes dentro de un frame")
+
+        # Se midió el camino completo: fondo, HUD re-teselado y cola vacía
+        self.assertEqual(renderer.hud.stats['retessellations'] - retessellations, FRAMES)
+        self.assertEqual(renderer.hud.stats['draw_calls'], 50 + FRAMES)
+        self.assertEqual(renderer.background_rotation_z, (50 + FRAMES) * 0.5 % 360)
+        self.assertEqual(renderer.cube_count, 0)
+        self.assertEqual(len(renderer.render_queue), 0)
+
+if __name__ == '__main__':
+    unittest.main()
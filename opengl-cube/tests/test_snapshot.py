@@ -0,0 +1,138 @@
+"""Ida y vuelta de los snapshots binarios de SnakeGame."""
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from main import SnakeGame
+from src.snapshot import SnapshotRing, fork_game, restore_snapshot, save_snapshot
+
+BOARD = 10
+
+def make_game(snake, seed=7):
+    game = SnakeGame(0, 0, headless=True, seed=seed, board_size=BOARD)
+    game.snake = [list(segment) for segment in snake]
+    game.food = [5, 5]
+    game.direction = [1, 0]
+    game.score = 30
+    return game
+
+def game_state(game):
+    return (game.board_size, [list(segment) for segment in game.snake],
+            list(game.direction), list(game.food), game.score, game.game_over,
+            game.rng.getstate())
+
+class SnapshotRoundTripTest(unittest.TestCase):
+
+    def assertRoundTrip(self, game):
+        restored = SnakeGame(0, 0, headless=True, board_size=BOARD)
+        restore_snapshot(restored, save_snapshot(game))
+        self.assertEqual(game_state(restored), game_state(game))
+
+    def test_body_wrapping_every_edge(self):
+        # Cruza el borde derecho, el izquierdo, el inferior y el superior
+        self.assertRoundTrip(make_game([[0, 3], [9, 3], [8, 3]]))
+        self.assertRoundTrip(make_game([[9, 3], [0, 3], [1, 3]]))
+        self.assertRoundTrip(make_game([[4, 0], [4, 9], [4, 8], [3, 8]]))
+        self.assertRoundTrip(make_game([[4, 9], [4, 0], [4, 1], [5, 1]]))
+
+    def test_lengths_not_divisible_by_four(self):
+        row = [[x, 2] for x in range(BOARD)]
+        for length in range(1, 10):
+            with self.subTest(length=length):
+                self.assertRoundTrip(make_game(row[:length][::-1]))
+
+    def test_rejects_non_adjacent_body(self):
+        with self.assertRaises(ValueError):
+            save_snapshot(make_game([[0, 0], [2, 0]]))
+
+    def test_rejects_foreign_data(self):
+        game = make_game([[3, 3], [2, 3], [1, 3]])
+        with self.assertRaises(ValueError):
+            restore_snapshot(game, b'XXXX' + save_snapshot(game)[4:])
+
+    def test_rng_continues_after_restore(self):
+        game = make_game([[3, 3], [2, 3], [1, 3]])
+        game.rng.gauss(0.0, 1.0)  # Deja gauss_next guardado
+        snapshot = save_snapshot(game)
+        expected = [game.generate_food() for _ in range(20)]
+
+        restored = restore_snapshot(SnakeGame(0, 0, headless=True, board_size=BOARD), snapshot)
+        self.assertEqual([restored.generate_food() for _ in range(20)], expected)
+        self.assertEqual(restored.rng.gauss(0.0, 1.0), game.rng.gauss(0.0, 1.0))
+
+    def test_fork_is_independent(self):
+        game = make_game([[3, 3], [2, 3], [1, 3]])
+        for fork in (fork_game(game), fork_game(game, save_snapshot(game))):
+            self.assertEqual(game_state(fork), game_state(game))
+            fork.update()
+            self.assertEqual(game.snake, [[3, 3], [2, 3], [1, 3]])
+
+class SnapshotRingTest(unittest.TestCase):
+
+    def play(self, game, ticks):
+        """Avanzar guardando el historial como el bucle principal"""
+        states = []
+        turns = [[1, 0], [0, 1], [-1, 0], [0, 1]]
+        for tick in range(ticks):
+            states.append(game_state(game))
+            game.history.push(game)
+            game.set_direction(turns[(tick // 3) % len(turns)])
+            game.update()
+        return states
+
+    def test_rewind_steps(self):
+        game = SnakeGame(0, 0, headless=True, seed=3, board_size=BOARD)
+        states = self.play(game, 30)
+
+        self.assertTrue(game.history.rewind(game, 1))
+        self.assertEqual(game_state(game), states[-1])
+        self.assertTrue(game.history.rewind(game, 10))
+        self.assertEqual(game_state(game), states[-11])
+        self.assertEqual(len(game.history), 19)
+
+        self.assertFalse(game.history.rewind(game, 0))
+        self.assertFalse(game.history.rewind(game, 20))
+        self.assertEqual(game_state(game), states[-11])
+
+    def test_rewind_then_replay_matches(self):
+        game = SnakeGame(0, 0, headless=True, seed=5, board_size=BOARD)
+        self.play(game, 20)
+        game.history.rewind(game, 5)
+        replay = SnakeGame(0, 0, headless=True, board_size=BOARD)
+        restore_snapshot(replay, save_snapshot(game))
+
+        self.assertEqual(self.play(game, 15), self.play(replay, 15))
+
+    def test_capacity_drops_oldest(self):
+        game = SnakeGame(0, 0, headless=True, seed=1, board_size=BOARD)
+        game.history = SnapshotRing(capacity=4)
+        states = self.play(game, 10)
+        self.assertEqual(len(game.history), 4)
+        self.assertFalse(game.history.rewind(game, 5))
+        self.assertTrue(game.history.rewind(game, 4))
+        self.assertEqual(game_state(game), states[-4])
+
+    def test_latest_matches_save_snapshot(self):
+        game = SnakeGame(0, 0, headless=True, seed=2, board_size=BOARD)
+        self.play(game, 5)
+        game.history.push(game)
+        self.assertEqual(game.history.latest(), save_snapshot(game))
+
+    def test_rng_state_is_shared_until_food_changes(self):
+        ring = SnapshotRing()
+        game = make_game([[3, 3], [2, 3], [1, 3]])
+        ring.push(game)
+        game.update()
+        ring.push(game)
+        self.assertIs(ring.snapshots[0][0], ring.snapshots[1][0])
+        self.assertLess(ring.nbytes(), 2 * len(save_snapshot(game)))
+
+        game.food = game.generate_food()
+        ring.push(game)
+        self.assertIsNot(ring.snapshots[2][0], ring.snapshots[1][0])
+
+if __name__ == '__main__':
+    unittest.main()
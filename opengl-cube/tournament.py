@@ -0,0 +1,160 @@
+"""Torneo headless de bots para SnakeGame.
+
+Juega muchas partidas con semilla en un pool de procesos, escribe cada
+resultado como una línea JSON (solo se añade al archivo) y calcula
+estadísticas con intervalos de confianza sin guardar todos los resultados
+en memoria.
+
+Ejemplo:
+    python tournament.py --bots random,greedy --games 10000 --output results.jsonl
+"""
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+from main import SnakeGame
+from src.bots import BOTS
+
+def play_match(task):
+    """Jugar una partida headless y devolver sus métricas"""
+    bot_name, seed, board_size, max_ticks = task
+    game = SnakeGame(0, 0, headless=True, seed=seed, board_size=board_size)
+    bot = BOTS[bot_name]
+    # Semilla distinta a la del juego para no compartir la secuencia de la comida
+    bot_rng = random.Random(f"{bot_name}:{seed}")
+
+    ticks = 0
+    start = time.perf_counter()
+    while not game.game_over and ticks < max_ticks:
+        game.set_direction(bot(game, bot_rng))
+        game.update()
+        ticks += 1
+    elapsed = time.perf_counter() - start
+
+    return {
+        'bot': bot_name,
+        'seed': seed,
+        'score': game.score,
+        'length': len(game.snake),
+        'ticks': ticks,
+        'won': game.won,
+        'timed_out': not game.game_over,
+        'us_per_tick': elapsed / ticks * 1e6 if ticks else 0.0
+    }
+
+class RunningStats:
+    """Media y varianza incrementales (algoritmo de Welford)"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def summary(self, z=1.96):
+        """Media, desviación estándar e intervalo de confianza (95% por defecto)"""
+        std = math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+        half_width = z * std / math.sqrt(self.count) if self.count else 0.0
+        return {
+            'mean': self.mean,
+            'std': std,
+            'ci_low': self.mean - half_width,
+            'ci_high': self.mean + half_width,
+            'min': self.min,
+            'max': self.max
+        }
+
+METRICS = ('score', 'length', 'ticks', 'us_per_tick')
+
+def generate_tasks(bots, games, base_seed, board_size, max_ticks):
+    """Generar tareas bajo demanda; cada bot juega las mismas semillas"""
+    for i in range(games):
+        for bot_name in bots:
+            yield (bot_name, base_seed + i, board_size, max_ticks)
+
+def run_tournament(bots, games, output, workers=None, base_seed=0, board_size=20,
+                   max_ticks=10000, chunksize=64):
+    """Ejecutar el torneo y devolver el resumen por bot"""
+    stats = {bot_name: {metric: RunningStats() for metric in METRICS} for bot_name in bots}
+    timeouts = {bot_name: 0 for bot_name in bots}
+    wins = {bot_name: 0 for bot_name in bots}
+    total = games * len(bots)
+
+    start = time.perf_counter()
+    tasks = generate_tasks(bots, games, base_seed, board_size, max_ticks)
+    with open(output, 'a') as results_file, multiprocessing.Pool(workers) as pool:
+        for done, result in enumerate(pool.imap_unordered(play_match, tasks, chunksize), 1):
+            results_file.write(json.dumps(result) + '\n')
+            for metric in METRICS:
+                stats[result['bot']][metric].add(result[metric])
+            timeouts[result['bot']] += result['timed_out']
+            wins[result['bot']] += result['won']
+            if done % 1000 == 0:
+                print(f"{done}/{total} partidas", file=sys.stderr)
+    elapsed = time.perf_counter() - start
+
+    summary = {
+        'games': total,
+        'seconds': elapsed,
+        'games_per_second': total / elapsed if elapsed else 0.0,
+        'bots': {}
+    }
+    for bot_name in bots:
+        summary['bots'][bot_name] = {metric: stats[bot_name][metric].summary() for metric in METRICS}
+        summary['bots'][bot_name]['timeouts'] = timeouts[bot_name]
+        summary['bots'][bot_name]['wins'] = wins[bot_name]
+    return summary
+
+def board_size_arg(value):
+    """Tipo de argparse para --board-size"""
+    size = int(value)
+    if size < 5:
+        raise argparse.ArgumentTypeError("el tablero debe medir al menos 5")
+    return size
+
+def main():
+    parser = argparse.ArgumentParser(description="Torneo headless de bots de Snake")
+    parser.add_argument('--bots', default=','.join(BOTS),
+                        help="Bots separados por comas (%s)" % ', '.join(BOTS))
+    parser.add_argument('--games', type=int, default=1000, help="Partidas por bot")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Procesos del pool")
+    parser.add_argument('--seed', type=int, default=0, help="Semilla base")
+    parser.add_argument('--board-size', type=board_size_arg, default=20, help="Lado del tablero (mínimo 5)")
+    parser.add_argument('--max-ticks', type=int, default=10000, help="Límite de ticks por partida")
+    parser.add_argument('--chunksize', type=int, default=64, help="Partidas por lote enviado a cada proceso")
+    parser.add_argument('--output', default='tournament_results.jsonl',
+                        help="Archivo JSONL donde se añaden los resultados")
+    parser.add_argument('--summary', help="Guardar el resumen en este archivo JSON")
+    args = parser.parse_args()
+
+    bots = [name.strip() for name in args.bots.split(',') if name.strip()]
+    unknown = [name for name in bots if name not in BOTS]
+    if unknown:
+        parser.error(f"Bots desconocidos: {', '.join(unknown)}")
+
+    summary = run_tournament(bots, args.games, args.output, workers=args.workers,
+                             base_seed=args.seed, board_size=args.board_size,
+                             max_ticks=args.max_ticks, chunksize=args.chunksize)
+
+    text = json.dumps(summary, indent=2)
+    print(text)
+    if args.summary:
+        with open(args.summary, 'w') as summary_file:
+            summary_file.write(text + '\n')
+
+if __name__ == "__main__":
+    main()